@@ -1,26 +1,37 @@
+import atexit
 import logging
 import os
 import json
+import re
 import smtplib
 import sys
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from email.mime.text import MIMEText
-from glob import glob
 from os import makedirs, path
 from typing import List, Dict, Optional, Union
-import pytz
+from zoneinfo import ZoneInfo
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import (
-    retry, 
-    stop_after_attempt, 
+    retry,
+    stop_after_attempt,
     wait_exponential,
-    wait_chain,
-    wait_fixed,
+    wait_random_exponential,
     retry_if_exception_type
 )
 from zzupy.app import CASClient, ECardClient
 
+# orjson（C实现）序列化比标准库快数倍且直接输出bytes，缺失时退回标准库json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -32,10 +43,17 @@ logger = logging.getLogger(__name__)
 THRESHOLD = 10.0
 EXCELLENT_THRESHOLD = 100.0
 JSON_FOLDER_PATH = "./page/data"
+CST_TZ = ZoneInfo("Asia/Shanghai")
 TOKEN_JSON_PATH = path.join(JSON_FOLDER_PATH, "tokens.json")
+LAST_RECORD_PATH = path.join(JSON_FOLDER_PATH, "last_record.json")
+
+# 数据目录在导入时保证一次即可，makedirs(exist_ok=True)本身幂等，
+# 各个写入点不再需要先stat再创建
+makedirs(JSON_FOLDER_PATH, exist_ok=True)
 
 # 重试配置常量
 RETRY_ATTEMPTS = 5
+REQUEST_TIMEOUT = (3, 7)  # (连接超时, 读取超时)，避免远端挂起时拖住整个运行
 RETRY_MULTIPLIER = 1
 INITIAL_WAIT = 15
 MAX_WAIT = 120
@@ -52,31 +70,56 @@ EMAIL = os.getenv("EMAIL")
 SMTP_CODE = os.getenv("SMTP_CODE")
 SMTP_SERVER = os.getenv("SMTP_SERVER")
 
+# 复用同一个 Session 发送所有 HTTP 通知，避免每次 POST 都重新建立 TCP+TLS 连接
+# （多个 Server 酱密钥时每个握手约 100-300ms，复用连接后只需握手一次）
+HTTP = requests.Session()
+HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+# Telegram MarkdownV2 要求转义的全部特殊字符，预编译成单次正则替换
+_MDV2_RE = re.compile(r'([_*\[\]()~`>#+\-=|{}.!\\])')
+
+
+def escape_mdv2(text: str) -> str:
+    """转义 Telegram MarkdownV2 的特殊字符"""
+    return _MDV2_RE.sub(r'\\\1', text)
+
+
+def _dumps(data: Union[List, Dict], pretty: bool = False) -> bytes:
+    """序列化为UTF-8字节串；pretty仅用于需要人工查看的文件"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(data, ensure_ascii=False, indent=2 if pretty else None).encode("utf-8")
+
+
+def _loads(data: bytes) -> Union[List, Dict]:
+    """从UTF-8字节串反序列化，与 _dumps 对称"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 # 通用重试装饰器
-def create_retry_decorator(stop_attempts=RETRY_ATTEMPTS, wait_strategy=None):
+def create_retry_decorator(stop_attempts=RETRY_ATTEMPTS, wait_strategy=None, retry_exceptions=Exception):
     """创建统一的重试装饰器"""
     if wait_strategy is None:
         wait_strategy = wait_exponential(
-            multiplier=RETRY_MULTIPLIER, 
-            min=INITIAL_WAIT, 
+            multiplier=RETRY_MULTIPLIER,
+            min=INITIAL_WAIT,
             max=MAX_WAIT
         )
-    
+
     return retry(
         stop=stop_after_attempt(stop_attempts),
         wait=wait_strategy,
-        retry=retry_if_exception_type(Exception),
+        retry=retry_if_exception_type(retry_exceptions),
         reraise=True
     )
 
-# 通用的请求重试装饰器
+# 通用的请求重试装饰器：亚秒级起步、带抖动的指数退避，瞬时5xx不用干等15s；
+# 只重试网络类异常，编程错误（如KeyError）不消耗重试次数
 request_retry = create_retry_decorator(
-    wait_strategy=wait_chain(
-        wait_fixed(15),  # 第一次等待15s
-        wait_fixed(30),  # 第二次等待30s
-        wait_exponential(multiplier=1, min=45, max=120)  # 后续按指数退避
-    )
+    wait_strategy=wait_random_exponential(multiplier=0.5, max=30),
+    retry_exceptions=(requests.RequestException, TimeoutError),
 )
 
 
@@ -93,17 +136,16 @@ class TokenManager:
                 "saved_at": DataManager.get_cst_time_str("%Y-%m-%d %H:%M:%S")
             }
             
-            # 确保目录存在
-            dirpath = path.dirname(TOKEN_JSON_PATH)
-            if dirpath and not path.exists(dirpath):
-                makedirs(dirpath, exist_ok=True)
-                
-            with open(TOKEN_JSON_PATH, "w", encoding="utf-8") as file:
+            # 原子写入并收紧权限，token只对当前用户可读
+            tmp_path = f"{TOKEN_JSON_PATH}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
                 json.dump(token_data, file, ensure_ascii=False, indent=2)
-            
-            logger.info(f"Token已保存到文件: {TOKEN_JSON_PATH}")
+            os.replace(tmp_path, TOKEN_JSON_PATH)
+            os.chmod(TOKEN_JSON_PATH, 0o600)
+
+            logger.info("Token已保存到文件: %s", TOKEN_JSON_PATH)
         except Exception as e:
-            logger.error(f"保存token失败: {e}")
+            logger.error("保存token失败: %s", e)
             raise
 
     @staticmethod
@@ -117,14 +159,14 @@ class TokenManager:
             with open(TOKEN_JSON_PATH, "r", encoding="utf-8") as file:
                 token_data = json.load(file)
             
-            logger.info(f"从文件加载token成功，保存时间: {token_data.get('saved_at', '未知')}")
+            logger.info("从文件加载token成功，保存时间: %s", token_data.get('saved_at', '未知'))
             return token_data
             
         except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.warning(f"读取token文件失败，将使用账号密码登录: {e}")
+            logger.warning("读取token文件失败，将使用账号密码登录: %s", e)
             return None
         except Exception as e:
-            logger.error(f"加载token时发生错误: {e}")
+            logger.error("加载token时发生错误: %s", e)
             return None
 
 
@@ -133,12 +175,14 @@ class EnergyMonitor:
     
     def __init__(self):
         self.cas_client = CASClient(ACCOUNT, PASSWORD)
+        self._token_data: Optional[Dict[str, str]] = None
         self.get_energy_balance = create_retry_decorator()(self._get_energy_balance)
 
     def _initialize_cas_client(self) -> bool:
         """初始化CAS客户端，尝试使用token登录"""
-        token_data = TokenManager.load_tokens()
-        
+        # 同一进程内复用已解析的token，重复调用不再回到磁盘
+        token_data = self._token_data or TokenManager.load_tokens()
+
         if token_data and token_data.get('user_token') and token_data.get('refresh_token'):
             try:
                 logger.info("尝试使用保存的token登录...")
@@ -146,20 +190,25 @@ class EnergyMonitor:
                 self.cas_client.login()
                 if self.cas_client.logged_in:
                     logger.info("使用保存的token登录成功")
+                    self._token_data = token_data
                     return True
                 else:
                     logger.warning("保存的token已失效，将使用账号密码重新登录")
             except Exception as e:
-                logger.warning(f"使用token登录失败: {e}，将使用账号密码登录")
+                logger.warning("使用token登录失败: %s，将使用账号密码登录", e)
         
         logger.info("使用账号密码进行CAS认证...")
         self.cas_client.login()
         if self.cas_client.logged_in:
             logger.info("CAS认证成功")
+            self._token_data = {
+                "user_token": self.cas_client.user_token,
+                "refresh_token": self.cas_client.refresh_token,
+            }
             try:
                 TokenManager.save_tokens(self.cas_client.user_token, self.cas_client.refresh_token)
             except Exception as e:
-                logger.error(f"保存token失败: {e}")
+                logger.error("保存token失败: %s", e)
             return True
         else:
             logger.error("CAS认证失败")
@@ -176,18 +225,72 @@ class EnergyMonitor:
             logger.info("一卡通系统登录成功")
             
             logger.info("获取照明和空调电量余额...")
-            lt_balance = ecard.get_remaining_energy(room=LT_ROOM)
-            ac_balance = ecard.get_remaining_energy(room=AC_ROOM)
-            
-            logger.info(f"照明剩余电量：{lt_balance} 度，空调剩余电量：{ac_balance} 度")
+            # 两个房间的查询互相独立，并发请求把该阶段耗时减半
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                lt_future = executor.submit(ecard.get_remaining_energy, room=LT_ROOM)
+                ac_future = executor.submit(ecard.get_remaining_energy, room=AC_ROOM)
+                lt_balance = lt_future.result()
+                ac_balance = ac_future.result()
+
+            logger.info("照明剩余电量：%s 度，空调剩余电量：%s 度", lt_balance, ac_balance)
             return {"lt_Balance": lt_balance, "ac_Balance": ac_balance}
 
 
+# 进程级单例：长驻进程（如调度器）里反复调用时复用CAS客户端和已解析的token
+_MONITOR_SINGLETON: Optional[EnergyMonitor] = None
+
+
+def get_monitor() -> EnergyMonitor:
+    global _MONITOR_SINGLETON
+    if _MONITOR_SINGLETON is None:
+        _MONITOR_SINGLETON = EnergyMonitor()
+    return _MONITOR_SINGLETON
+
+
+class SMTPPool:
+    """SMTP连接池，复用已认证的连接，避免每封邮件都重复 TLS 握手和登录"""
+
+    def __init__(self):
+        self.client: Optional[smtplib.SMTP_SSL] = None
+
+    def _connect(self) -> smtplib.SMTP_SSL:
+        client = smtplib.SMTP_SSL(SMTP_SERVER, smtplib.SMTP_SSL_PORT)
+        client.login(EMAIL, SMTP_CODE)
+        return client
+
+    def send(self, msg: MIMEText) -> None:
+        """发送邮件，连接失效时自动重连"""
+        if self.client is not None:
+            try:
+                self.client.noop()
+            except (smtplib.SMTPServerDisconnected, OSError):
+                logger.info("SMTP 连接已断开，将重新连接")
+                self.client = None
+        if self.client is None:
+            self.client = self._connect()
+        self.client.sendmail(EMAIL, EMAIL, msg.as_string())
+
+    def close(self) -> None:
+        if self.client is not None:
+            try:
+                self.client.quit()
+            except Exception:
+                pass
+            self.client = None
+
+
+# 进程内共享的SMTP连接，退出时统一关闭。重试只包住发送本身：连接还活着时
+# 重试不重做TLS握手+AUTH，断开时由SMTPPool.send内部按需重连
+SMTP_POOL = SMTPPool()
+atexit.register(SMTP_POOL.close)
+_smtp_send_with_retry = create_retry_decorator()(SMTP_POOL.send)
+
+
 class NotificationManager:
     """通知管理器，负责发送各种通知"""
-    
+
     @staticmethod
-    def format_balance_report(lt_balance: float, ac_balance: float, escape_dot: bool = False) -> str:
+    def format_balance_report(lt_balance: float, ac_balance: float) -> str:
         def get_status(balance: float) -> str:
             if balance > EXCELLENT_THRESHOLD:
                 return "充足"
@@ -196,14 +299,9 @@ class NotificationManager:
             else:
                 return "⚠️警告"
 
-        lt_status = get_status(lt_balance)
-        ac_status = get_status(ac_balance)
-        lt_balance_str = str(lt_balance).replace(".", "\\.") if escape_dot else str(lt_balance)
-        ac_balance_str = str(ac_balance).replace(".", "\\.") if escape_dot else str(ac_balance)
-
         return (
-            f"💡 照明剩余电量：{lt_balance_str} 度（{lt_status}）\n"
-            f"❄️ 空调剩余电量：{ac_balance_str} 度（{ac_status}）\n\n"
+            f"💡 照明剩余电量：{lt_balance} 度（{get_status(lt_balance)}）\n"
+            f"❄️ 空调剩余电量：{ac_balance} 度（{get_status(ac_balance)}）\n\n"
         )
 
     @staticmethod
@@ -211,34 +309,43 @@ class NotificationManager:
         return balances['lt_Balance'] <= THRESHOLD or balances['ac_Balance'] <= THRESHOLD
 
     @staticmethod
-    @request_retry
     def send_serverchan_notification(title: str, content: str) -> None:
         if not SERVERCHAN_KEYS:
             logger.info("未配置 SERVERCHAN_KEYS，跳过 Server 酱通知")
             return
-            
+
+        keys = [key.strip() for key in SERVERCHAN_KEYS.split(',') if key.strip()]
+        if not keys:
+            return
+
         logger.info("通过 Server 酱发送通知...")
-        for key in SERVERCHAN_KEYS.split(','):
-            key = key.strip()
-            if not key:
-                continue
-                
+        payload = {"title": title, "desp": content}
+
+        @request_retry
+        def send_one(key: str) -> None:
             url = f"https://sctapi.ftqq.com/{key}.send"
-            payload = {"title": title, "desp": content}
-            response = requests.post(url, data=payload, timeout=10)
+            response = HTTP.post(url, data=payload, timeout=REQUEST_TIMEOUT)
             try:
                 result = response.json()
             except ValueError:
                 logger.error("Server酱返回非 JSON，返回文本：%s", response.text)
-                continue
+                return
 
             if result.get("code") == 0:
-                logger.info(f"Server 酱通知发送成功，使用的密钥：{key}")
+                logger.info("Server 酱通知发送成功，使用的密钥：%s", key)
             else:
-                logger.error(f"Server 酱通知发送失败，错误信息：{result.get('message')}")
+                logger.error("Server 酱通知发送失败，错误信息：%s", result.get('message'))
+
+        # 多个密钥并发发送，单个密钥的失败和重试不影响其他密钥
+        with ThreadPoolExecutor(max_workers=min(4, len(keys))) as executor:
+            futures = [executor.submit(send_one, key) for key in keys]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error("Server 酱通知发送失败: %s", e)
 
     @staticmethod
-    @create_retry_decorator()
     def send_email_notification(title: str, content: str) -> None:
         if not all([EMAIL, SMTP_CODE, SMTP_SERVER]):
             logger.info("邮件配置不完整，跳过邮件通知")
@@ -250,10 +357,7 @@ class NotificationManager:
         msg['From'] = EMAIL
         msg['To'] = EMAIL
 
-        client = smtplib.SMTP_SSL(SMTP_SERVER, smtplib.SMTP_SSL_PORT)
-        client.login(EMAIL, SMTP_CODE)
-        client.sendmail(EMAIL, EMAIL, msg.as_string())
-        client.quit()
+        _smtp_send_with_retry(msg)
         logger.info("邮件发送成功")
 
     @staticmethod
@@ -269,7 +373,7 @@ class NotificationManager:
             "text": f"*{title}*\n\n{content}",
             "parse_mode": "MarkdownV2"
         }
-        response = requests.post(url, data=payload, timeout=10)
+        response = HTTP.post(url, data=payload, timeout=REQUEST_TIMEOUT)
         result = response.json()
 
         if not result.get("ok"):
@@ -280,85 +384,210 @@ class NotificationManager:
     def notify_admin(cls, title: str, balances: Dict[str, float]) -> None:
         logger.info("准备发送通知...")
         is_low_energy = cls.is_low_energy(balances)
-        email_content = cls.format_balance_report(balances["lt_Balance"], balances["ac_Balance"], escape_dot=False)
-        
+        # 报告只渲染一次，Telegram 版本由整段文本做一遍 MarkdownV2 转义得到
+        report = cls.format_balance_report(balances["lt_Balance"], balances["ac_Balance"])
+
+        tasks = []
         if is_low_energy:
-            email_content += "⚠️ 电量不足，请尽快充电！"
-            cls.send_serverchan_notification(title, email_content)
-            cls.send_email_notification(title, email_content)
+            email_content = report + "⚠️ 电量不足，请尽快充电！"
+            tasks.append((cls.send_serverchan_notification, (title, email_content)))
+            tasks.append((cls.send_email_notification, (title, email_content)))
         else:
             logger.info("电量充足，跳过 Server 酱和邮件通知")
 
-        telegram_content = cls.format_balance_report(balances["lt_Balance"], balances["ac_Balance"], escape_dot=True)
+        telegram_content = escape_mdv2(report)
         telegram_content += "⚠️ 电量不足，请尽快充电！" if is_low_energy else "当前电量充足，请保持关注。"
-        cls.send_telegram_notification(title, telegram_content)
+        tasks.append((cls.send_telegram_notification, (title, telegram_content)))
+
+        # 各通知渠道互相独立，并发发送，总耗时从各渠道之和降为最慢渠道的耗时
+        # 重试逻辑仍在各自的发送函数内部，单个渠道失败不影响其他渠道
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(fn, *args) for fn, args in tasks]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error("通知发送失败: %s", e)
 
 
 class DataManager:
     """数据管理器"""
-    
+
+    # 解析结果缓存：file_path -> (mtime_ns, size, data)
+    # 文件未变化时直接复用上次解析的结果，跳过重复的 JSON 解码
+    _json_cache: Dict[str, tuple] = {}
+
+    # 月份列表缓存：数据目录的mtime未变化说明没有新增/删除月度文件，
+    # 直接复用上次扫描的结果，省掉一次glob和其中每个文件的stat
+    _months_cache: Dict = {"mtime": None, "list": []}
+
     @staticmethod
     def get_cst_time_str(format_str: str) -> str:
-        cst_tz = pytz.timezone('Asia/Shanghai')
-        return datetime.now(cst_tz).strftime(format_str)
+        return datetime.now(CST_TZ).strftime(format_str)
+
+    @classmethod
+    def load_data_from_json(cls, file_path: str) -> Optional[List[Dict]]:
+        try:
+            st = os.stat(file_path)
+            cached = cls._json_cache.get(file_path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+            # 二进制整读一次 + C 层解码，避免文本模式的逐块缓冲和再编码
+            with open(file_path, "rb") as file:
+                data = _loads(file.read())
+            cls._json_cache[file_path] = (st.st_mtime_ns, st.st_size, data)
+            return data
+        except (FileNotFoundError, ValueError) as e:
+            logger.warning("加载JSON文件失败 %s: %s", file_path, e)
+            return None
 
     @staticmethod
-    def load_data_from_json(file_path: str) -> Optional[List[Dict]]:
+    def load_data_from_jsonl(file_path: str, maxlen: Optional[int] = None) -> Optional[List[Dict]]:
+        """逐行读取JSONL文件，maxlen不为空时只保留末尾N条记录"""
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.warning(f"加载JSON文件失败 {file_path}: {e}")
+            records = deque(maxlen=maxlen) if maxlen else []
+            with open(file_path, "rb") as file:
+                for line in file:
+                    line = line.strip()
+                    if line:
+                        records.append(_loads(line))
+            return list(records)
+        except (FileNotFoundError, ValueError) as e:
+            logger.warning("加载JSONL文件失败 %s: %s", file_path, e)
             return None
 
+    @classmethod
+    def load_month(cls, month: str, maxlen: Optional[int] = None) -> Optional[List[Dict]]:
+        """加载某个月份的记录，优先读取JSONL，兼容旧的整文件JSON格式"""
+        jsonl_path = f"{JSON_FOLDER_PATH}/{month}.jsonl"
+        if path.exists(jsonl_path):
+            return cls.load_data_from_jsonl(jsonl_path, maxlen=maxlen)
+        return cls.load_data_from_json(f"{JSON_FOLDER_PATH}/{month}.json")
+
     @staticmethod
-    def dump_data_into_json(data: Union[List, Dict], file_path: str, indent: int = 4) -> None:
+    def dump_data_into_json(data: Union[List, Dict], file_path: str, pretty: bool = True) -> None:
+        # 先整体写入临时文件再原子重命名，单次write系统调用，写到一半
+        # 崩溃也不会留下损坏的目标文件
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
         try:
-            dirpath = path.dirname(file_path)
-            if dirpath and not path.exists(dirpath):
-                makedirs(dirpath, exist_ok=True)
-            with open(file_path, "w", encoding="utf-8") as file:
-                json.dump(data, file, ensure_ascii=False, indent=indent)
-            logger.info(f"数据成功保存到文件：{file_path}")
+            with open(tmp_path, "wb") as file:
+                file.write(_dumps(data, pretty=pretty))
+            os.replace(tmp_path, file_path)
+            logger.info("数据成功保存到文件：%s", file_path)
         except Exception as e:
-            logger.error(f"保存数据失败：{e}")
+            logger.error("保存数据失败：%s", e)
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
 
     @classmethod
-    def record_data(cls, data: Dict) -> Optional[List[Dict]]:
-        file_path = f"{JSON_FOLDER_PATH}/{cls.get_cst_time_str('%Y-%m')}.json"
-        existing_data = cls.load_data_from_json(file_path) or []
-        existing_data.append(data)
-        cls.dump_data_into_json(existing_data, file_path)
-        return existing_data
+    def record_data(cls, data: Dict) -> bool:
+        """追加一条记录，返回是否实际写入（余额未变化时跳过）"""
+        month = cls.get_cst_time_str('%Y-%m')
+        file_path = f"{JSON_FOLDER_PATH}/{month}.jsonl"
+
+        # 电表读数在两次运行之间通常没有变化，先比对只存上次余额的旁路文件，
+        # 无变化时直接返回，完全不用打开正在增长的月度文件
+        try:
+            with open(LAST_RECORD_PATH, "r", encoding="utf-8") as file:
+                last_record = json.load(file)
+            if (last_record.get("lt") == data["lt_Balance"]
+                    and last_record.get("ac") == data["ac_Balance"]
+                    and last_record.get("path") == file_path):
+                logger.info("电量余额与上次记录相同，跳过本次写入")
+                return False
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        # 旧的整文件JSON只在首次运行时迁移一次
+        legacy_path = f"{JSON_FOLDER_PATH}/{month}.json"
+        if path.exists(legacy_path) and not path.exists(file_path):
+            legacy_data = cls.load_data_from_json(legacy_path) or []
+            with open(file_path, "wb") as file:
+                for record in legacy_data:
+                    file.write(_dumps(record) + b"\n")
+            os.remove(legacy_path)
+            logger.info("已将旧格式 %s 迁移为 JSONL", legacy_path)
+
+        # 追加一行即可，无需读入并整体重写月度文件
+        with open(file_path, "ab") as file:
+            file.write(_dumps(data) + b"\n")
+        logger.info("数据成功追加到文件：%s", file_path)
+
+        with open(LAST_RECORD_PATH, "w", encoding="utf-8") as file:
+            json.dump({"lt": data["lt_Balance"], "ac": data["ac_Balance"], "path": file_path}, file)
+        return True
 
     @classmethod
     def update_time_list(cls) -> List[str]:
-        if not path.exists(JSON_FOLDER_PATH):
-            raise FileNotFoundError(f"文件夹路径不存在：{JSON_FOLDER_PATH}")
+        dir_mtime = os.stat(JSON_FOLDER_PATH).st_mtime_ns
+        if dir_mtime == cls._months_cache["mtime"]:
+            return cls._months_cache["list"]
 
         time_json_path = './page/data/time.json'
-        if not path.exists(time_json_path):
-            cls.dump_data_into_json([], time_json_path)
 
-        json_files = [
-            path.splitext(path.basename(it))[0] 
-            for it in glob(path.join(JSON_FOLDER_PATH, "????-??.json"))
-        ]
-        json_files = sorted(json_files, key=lambda x: datetime.strptime(x, '%Y-%m'), reverse=True)
+        # 单次scandir配合简单的文件名过滤，比glob的两遍fnmatch匹配更轻
+        with os.scandir(JSON_FOLDER_PATH) as entries:
+            json_files = {
+                entry.name.rsplit('.', 1)[0]
+                for entry in entries
+                if entry.is_file()
+                and entry.name.endswith(('.json', '.jsonl'))
+                and len(entry.name.rsplit('.', 1)[0]) == 7
+                and entry.name[4] == '-'
+            }
+        # YYYY-MM 文件名的字典序即时间序，无需逐个 strptime 解析
+        json_files = sorted(json_files, reverse=True)
 
-        cls.dump_data_into_json(json_files, time_json_path)
+        # 列表没有变化时跳过重写：省一次写入，也不会无谓刷新文件mtime
+        if json_files != cls.load_data_from_json(time_json_path):
+            cls.dump_data_into_json(json_files, time_json_path, pretty=False)
+        cls._months_cache.update(mtime=os.stat(JSON_FOLDER_PATH).st_mtime_ns, list=json_files)
         logger.info("时间列表更新成功")
         return json_files
 
+    @classmethod
+    def save_and_publish(cls, latest_record: Dict) -> None:
+        """记录最新数据并同步更新 time.json 与 last_30_records.json"""
+        if not cls.record_data(latest_record):
+            logger.info("电量无变化，跳过数据更新")
+            return
+
+        # last_30_records.json 本身就是滚动窗口：常态下读30条、追加1条、
+        # 写回，不再重扫月度文件；窗口文件缺失或损坏时回填一次
+        output_path = f"{JSON_FOLDER_PATH}/last_30_records.json"
+        window = cls.load_data_from_json(output_path)
+        if window is None:
+            # 只有回填才需要重读本月文件的末尾
+            month = cls.get_cst_time_str('%Y-%m')
+            cls.parse_and_update_data(cls.load_month(month, maxlen=30))
+            return
+
+        cls.update_time_list()
+        records = deque(window, maxlen=30)
+        records.append(latest_record)
+        cls.dump_data_into_json(list(records), output_path)
+        logger.info("数据解析和更新完成")
+
     @classmethod
     def parse_and_update_data(cls, existing_data: Optional[List[Dict]]) -> None:
         time_file_list = cls.update_time_list()
-        existing_data_length = len(existing_data) if existing_data else 0
-        if existing_data_length < 30 and len(time_file_list) > 1:
-            prev_month_data = cls.load_data_from_json(f"{JSON_FOLDER_PATH}/{time_file_list[1]}.json") or []
-            records_to_retrieve = min(30 - existing_data_length, len(prev_month_data))
-            existing_data = prev_month_data[-records_to_retrieve:] + (existing_data or [])
-        cls.dump_data_into_json((existing_data or [])[-30:], f"{JSON_FOLDER_PATH}/last_30_records.json")
+        existing_data = existing_data or []
+        output_path = f"{JSON_FOLDER_PATH}/last_30_records.json"
+
+        # 常态路径：本月已有≥30条记录（或只有一个月的数据），不碰上月文件
+        if len(existing_data) >= 30 or len(time_file_list) <= 1:
+            cls.dump_data_into_json(existing_data[-30:], output_path)
+            logger.info("数据解析和更新完成")
+            return
+
+        # 月初边界：用上月末尾的记录把窗口补齐到30条
+        # 定长deque自动只保留末尾30条，免去中间列表拼接和切片的复制
+        records = deque(maxlen=30)
+        records.extend(cls.load_month(time_file_list[1]) or [])
+        records.extend(existing_data)
+        cls.dump_data_into_json(list(records), output_path)
         logger.info("数据解析和更新完成")
 
 
@@ -368,10 +597,10 @@ def main():
     required_env_vars = ["ACCOUNT", "PASSWORD", "lt_room", "ac_room"]
     missing_vars = [var for var in required_env_vars if not os.getenv(var)]
     if missing_vars:
-        logger.error(f"缺少必要的环境变量: {', '.join(missing_vars)}")
+        logger.error("缺少必要的环境变量: %s", ', '.join(missing_vars))
         return
 
-    monitor = EnergyMonitor()
+    monitor = get_monitor()
     try:
         balances = monitor.get_energy_balance()
     except Exception as e:
@@ -387,19 +616,19 @@ def main():
         "ac_Balance": balances["ac_Balance"]
     }
 
-    data = DataManager.record_data(latest_record)
-    DataManager.parse_and_update_data(data)
+    DataManager.save_and_publish(latest_record)
     logger.info("程序运行结束")
 
 if __name__ == "__main__":
     main()
 
-    # 打印存活线程，辅助调试
-    for t in threading.enumerate():
-        print(f"存活线程: {t.name}, daemon={t.daemon}")
+    # 线程巡检只在调试时开启，常规定时任务不付出枚举锁和0.5s等待的成本
+    if os.getenv("DEBUG_THREADS"):
+        for t in threading.enumerate():
+            logger.info("存活线程: %s, daemon=%s", t.name, t.daemon)
+        time.sleep(0.5)
 
-    # 优雅退出
-    import time, os
+    # os._exit 不经过 atexit，这里显式收尾；atexit 钩子留给被当作库导入的场景
+    SMTP_POOL.close()
     logging.shutdown()
-    time.sleep(0.5)
-    os._exit(0)  # 确保彻底退出
+    os._exit(0)  # 第三方库的线程未必是daemon，强制退出避免定时任务挂住